@@ -14,17 +14,80 @@ Example:
     python junit_to_html.py reports/verify-1758049908.148396.xml report.html
 """
 
-import xml.etree.ElementTree as ET
+import html
 import json
+import re
 import sys
 import os
 from datetime import datetime
+from functools import lru_cache
+from string import Template
 from typing import Dict, List, Optional, Tuple
+from xml.parsers import expat
 
+# Patterns used by clean_test_name
+_RE_HOST = re.compile(r'\[[^\]]+\]\s*')
+_RE_VERIFY = re.compile(r'^Verify:\s*', re.IGNORECASE)
+_RE_TESTCASE = re.compile(r'^TEST_CASE:\s*', re.IGNORECASE)
+_RE_LONG_PARENS = re.compile(r'\s*\([^)]{50,}\)')
+# Verbose module arguments; everything from the first one onwards is dropped
+_RE_TAIL = re.compile(
+    r'\s+(?:that=|fail_msg=|success_msg=|port=\d+|host=|state=|timeout=\d+).*')
+_RE_WS = re.compile(r'\s+')
 
-class JUnitToHTMLConverter:
-    def __init__(self):
-        self.css_styles = """
+# Size of the chunks fed to the XML parser
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=4096)
+def _clean_test_name(test_name: str) -> str:
+    """Clean up test name; results are cached as names repeat across hosts."""
+    if not test_name:
+        return "Unknown Test"
+    
+    # Remove common prefixes and suffixes
+    cleaned = test_name
+    
+    # Remove host information like [centos], [ubuntu]
+    cleaned = _RE_HOST.sub('', cleaned)
+    
+    # Remove "Verify:" prefix
+    cleaned = _RE_VERIFY.sub('', cleaned)
+    
+    # Remove "TEST_CASE:" prefix
+    cleaned = _RE_TESTCASE.sub('', cleaned)
+    
+    # Remove long parameter lists in parentheses
+    cleaned = _RE_LONG_PARENS.sub('', cleaned)
+    
+    # Remove long parameter lists after commas
+    if ',' in cleaned:
+        parts = cleaned.split(',')
+        if len(parts) > 1:
+            # Keep only the first meaningful part
+            cleaned = parts[0].strip()
+    
+    # Remove common verbose patterns
+    cleaned = _RE_TAIL.sub('', cleaned)
+    
+    # Clean up extra whitespace
+    cleaned = _RE_WS.sub(' ', cleaned).strip()
+    
+    # If the name is still too long, truncate it
+    if len(cleaned) > 60:
+        cleaned = cleaned[:57] + "..."
+    
+    return cleaned if cleaned else "Test Case"
+
+
+@lru_cache(maxsize=8192)
+def _escape_html(text: str) -> str:
+    """Escape HTML special characters; results are cached as class names and messages repeat."""
+    return html.escape(text, quote=True) if text else ''
+
+
+# Static styles and scripts embedded in every report
+_CSS_STYLES = """
         <style>
             * {
                 margin: 0;
@@ -445,14 +508,250 @@ class JUnitToHTMLConverter:
         </script>
         """
 
+
+# Page skeleton; test case rows are rendered in between
+_HTML_HEAD = Template("""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Test Report - $name</title>
+    $css
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🧪 Test Report</h1>
+            <div class="subtitle">
+                $name • Generated on $generated
+            </div>$source_section
+        </div>
+        
+        <div class="stats-grid">
+            <div class="stat-card">
+                <div class="stat-number tests-total">$tests</div>
+                <div class="stat-label">Total Tests</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number tests-passed">$passed</div>
+                <div class="stat-label">Passed</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number tests-failed">$failures</div>
+                <div class="stat-label">Failed</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number tests-errors">$errors</div>
+                <div class="stat-label">Errors</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number tests-skipped">$skipped</div>
+                <div class="stat-label">Skipped</div>
+            </div>
+            <div class="stat-card">
+                <div class="stat-number">$total_time</div>
+                <div class="stat-label">Total Time</div>
+            </div>
+        </div>
+        
+        <div class="test-results">
+            <div class="test-results-header">
+                <div>📋 Test Cases ($case_count)</div>
+                <div class="bulk-actions">
+                    <button class="bulk-action-btn" id="expand-all">Expand All</button>
+                    <button class="bulk-action-btn" id="collapse-all">Collapse All</button>
+                </div>
+            </div>
+""")
+
+_HTML_TAIL = Template("""
+        </div>
+        
+        <div class="footer">
+            <p>Generated by JUnit to HTML Converter • $generated</p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+# CSS class and label shown for each test status
+_STATUS_CLASS = {
+    'passed': 'status-passed',
+    'failed': 'status-failed',
+    'skipped': 'status-skipped',
+    'error': 'status-error',
+}
+
+_STATUS_TEXT = {
+    'passed': 'PASSED',
+    'failed': 'FAILED',
+    'skipped': 'SKIPPED',
+    'error': 'ERROR',
+}
+
+# Status-specific detail blocks and the TestCase attribute holding their message
+_STATUS_BLOCK = {
+    'skipped': """
+                    <div class="skipped-reason">
+                        <strong>Skip Reason:</strong> {}
+                    </div>
+""",
+    'error': """
+                    <div class="error-message">
+                        <strong>Error:</strong> {}
+                    </div>
+""",
+    'failed': """
+                    <div class="error-message">
+                        <strong>Failure:</strong> {}
+                    </div>
+""",
+}
+
+_STATUS_FIELD = {
+    'skipped': 'skipped',
+    'error': 'error',
+    'failed': 'failure',
+}
+
+# System output block and closing markup of an indented test case row
+_SYSTEM_OUT_BLOCK = """
+                    <div class="system-out">
+                        <strong>Output:</strong>
+{}
+                    </div>
+"""
+
+_TEST_CASE_TAIL = """
+                </div>
+            </div>
+"""
+
+
+class TestCase:
+    """Single test case parsed from a JUnit report."""
+    
+    __slots__ = ('name', 'classname', 'name_esc', 'classname_esc', 'time', 'status',
+                 'system_out', 'skipped', 'error', 'failure')
+    
+    def __init__(self, name: str, classname: str, time: float):
+        self.name = name
+        self.classname = classname
+        # Escaped once here; class names repeat across cases, so intern them
+        self.name_esc = _escape_html(name)
+        self.classname_esc = sys.intern(_escape_html(classname))
+        self.time = time
+        self.status = 'passed'
+        self.system_out = ''
+        self.skipped = ''
+        self.error = ''
+        self.failure = ''
+
+
+class _JUnitHandler:
+    """Expat callbacks collecting the test cases of the first testsuite."""
+    
+    def __init__(self):
+        self.suite_attrs = None
+        self.test_cases = []
+        self.depth = 0
+        self.in_suite = False
+        self.case = None
+        # Text of the first child element of each tag in the current test case
+        self.children = {}
+        self.text_tag = None
+        self.text_buf = []
+    
+    def start(self, tag: str, attrs: Dict[str, str]) -> None:
+        self.depth += 1
+        depth = self.depth
+        if depth == 2:
+            # Use the first testsuite found directly under the root
+            if self.suite_attrs is None and tag == 'testsuite':
+                self.suite_attrs = attrs
+                self.in_suite = True
+        elif depth == 3:
+            if self.in_suite and tag == 'testcase':
+                self.case = TestCase(
+                    attrs.get('name', 'Unknown'),
+                    attrs.get('classname', ''),
+                    float(attrs.get('time', 0))
+                )
+                self.children = {}
+        elif depth == 4:
+            if self.case is not None and tag not in self.children:
+                self.children[tag] = ''
+                self.text_tag = tag
+                self.text_buf = []
+        elif self.text_tag is not None:
+            # Element text only runs up to the first nested element
+            self._flush_text()
+    
+    def end(self, tag: str) -> None:
+        depth = self.depth
+        self.depth -= 1
+        if depth == 4:
+            if self.text_tag is not None:
+                self._flush_text()
+        elif depth == 3:
+            if self.case is not None:
+                self._finish_case()
+        elif depth == 2:
+            self.in_suite = False
+    
+    def chars(self, data: str) -> None:
+        if self.text_tag is not None:
+            self.text_buf.append(data)
+    
+    def _flush_text(self) -> None:
+        self.children[self.text_tag] = ''.join(self.text_buf)
+        self.text_tag = None
+    
+    def _finish_case(self) -> None:
+        case_data = self.case
+        children = self.children
+        
+        # Check for different test outcomes
+        if 'skipped' in children:
+            case_data.status = 'skipped'
+            case_data.skipped = children['skipped'] or 'Skipped'
+        elif 'error' in children:
+            case_data.status = 'error'
+            case_data.error = children['error'] or 'Error occurred'
+        elif 'failure' in children:
+            case_data.status = 'failed'
+            case_data.failure = children['failure'] or 'Test failed'
+        
+        # Get system output
+        system_out = children.get('system-out')
+        if system_out:
+            case_data.system_out = system_out.strip()
+        
+        self.test_cases.append(case_data)
+        self.case = None
+
+
+class JUnitToHTMLConverter:
     def parse_junit_xml(self, xml_file: str) -> Dict:
         """Parse JUnit XML file and extract test data."""
         try:
-            tree = ET.parse(xml_file)
-            root = tree.getroot()
+            handler = _JUnitHandler()
+            parser = expat.ParserCreate()
+            parser.buffer_text = True
+            parser.StartElementHandler = handler.start
+            parser.EndElementHandler = handler.end
+            parser.CharacterDataHandler = handler.chars
+            
+            # Stream the XML through expat in fixed-size chunks; no element tree is built
+            with open(xml_file, 'rb', buffering=_READ_CHUNK_SIZE) as f:
+                while chunk := f.read(_READ_CHUNK_SIZE):
+                    parser.Parse(chunk, False)
+                parser.Parse(b'', True)
             
             # Extract testsuite data
-            testsuite = root.find('testsuite')
+            testsuite = handler.suite_attrs
             if testsuite is None:
                 raise ValueError("No testsuite found in XML")
             
@@ -465,46 +764,15 @@ class JUnitToHTMLConverter:
                 'failures': int(testsuite.get('failures', 0)),
                 'skipped': int(testsuite.get('skipped', 0)),
                 'time': float(testsuite.get('time', 0)),
-                'test_cases': []
+                'test_cases': handler.test_cases
             }
             
             # Calculate passed tests
             suite_data['passed'] = suite_data['tests'] - suite_data['errors'] - suite_data['failures'] - suite_data['skipped']
             
-            # Parse test cases
-            for testcase in testsuite.findall('testcase'):
-                case_data = {
-                    'name': testcase.get('name', 'Unknown'),
-                    'classname': testcase.get('classname', ''),
-                    'time': float(testcase.get('time', 0)),
-                    'status': 'passed',
-                    'system_out': '',
-                    'skipped': '',
-                    'error': '',
-                    'failure': ''
-                }
-                
-                # Check for different test outcomes
-                if testcase.find('skipped') is not None:
-                    case_data['status'] = 'skipped'
-                    case_data['skipped'] = testcase.find('skipped').text or 'Skipped'
-                elif testcase.find('error') is not None:
-                    case_data['status'] = 'error'
-                    case_data['error'] = testcase.find('error').text or 'Error occurred'
-                elif testcase.find('failure') is not None:
-                    case_data['status'] = 'failed'
-                    case_data['failure'] = testcase.find('failure').text or 'Test failed'
-                
-                # Get system output
-                system_out = testcase.find('system-out')
-                if system_out is not None and system_out.text:
-                    case_data['system_out'] = system_out.text.strip()
-                
-                suite_data['test_cases'].append(case_data)
-            
             return suite_data
             
-        except ET.ParseError as e:
+        except expat.ExpatError as e:
             raise ValueError(f"Invalid XML file: {e}")
         except Exception as e:
             raise ValueError(f"Error parsing XML: {e}")
@@ -522,53 +790,12 @@ class JUnitToHTMLConverter:
 
     def clean_test_name(self, test_name: str) -> str:
         """Clean up test name to make it shorter and more readable."""
-        if not test_name:
-            return "Unknown Test"
-        
-        # Remove common prefixes and suffixes
-        cleaned = test_name
-        
-        # Remove host information like [centos], [ubuntu]
-        import re
-        cleaned = re.sub(r'\[[^\]]+\]\s*', '', cleaned)
-        
-        # Remove "Verify:" prefix
-        cleaned = re.sub(r'^Verify:\s*', '', cleaned, flags=re.IGNORECASE)
-        
-        # Remove "TEST_CASE:" prefix
-        cleaned = re.sub(r'^TEST_CASE:\s*', '', cleaned, flags=re.IGNORECASE)
-        
-        # Remove long parameter lists in parentheses
-        cleaned = re.sub(r'\s*\([^)]{50,}\)', '', cleaned)
-        
-        # Remove long parameter lists after commas
-        if ',' in cleaned:
-            parts = cleaned.split(',')
-            if len(parts) > 1:
-                # Keep only the first meaningful part
-                first_part = parts[0].strip()
-                # Remove common suffixes from first part
-                first_part = re.sub(r'\s+(that=|fail_msg=|success_msg=).*', '', first_part)
-                cleaned = first_part
-        
-        # Remove common verbose patterns
-        cleaned = re.sub(r'\s+(that=|fail_msg=|success_msg=).*', '', cleaned)
-        cleaned = re.sub(r'\s+port=\d+.*', '', cleaned)
-        cleaned = re.sub(r'\s+host=.*', '', cleaned)
-        cleaned = re.sub(r'\s+state=.*', '', cleaned)
-        cleaned = re.sub(r'\s+timeout=\d+.*', '', cleaned)
-        
-        # Clean up extra whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        
-        # If the name is still too long, truncate it
-        if len(cleaned) > 60:
-            cleaned = cleaned[:57] + "..."
-        
-        return cleaned if cleaned else "Test Case"
+        return _clean_test_name(test_name)
 
     def generate_html(self, test_data: Dict, output_file: str, source_file: str = "") -> None:
         """Generate HTML report from test data."""
+        now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
         # Build source info section
         source_section = ""
         if source_file:
@@ -578,74 +805,63 @@ class JUnitToHTMLConverter:
                 <div class="source-path">{self.escape_html(source_file)}</div>
             </div>"""
         
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Test Report - {test_data['name']}</title>
-    {self.css_styles}
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🧪 Test Report</h1>
-            <div class="subtitle">
-                {test_data['name']} • Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-            </div>{source_section}
-        </div>
-        
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-number tests-total">{test_data['tests']}</div>
-                <div class="stat-label">Total Tests</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number tests-passed">{test_data['passed']}</div>
-                <div class="stat-label">Passed</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number tests-failed">{test_data['failures']}</div>
-                <div class="stat-label">Failed</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number tests-errors">{test_data['errors']}</div>
-                <div class="stat-label">Errors</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number tests-skipped">{test_data['skipped']}</div>
-                <div class="stat-label">Skipped</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{self.format_time(test_data['time'])}</div>
-                <div class="stat-label">Total Time</div>
-            </div>
-        </div>
-        
-        <div class="test-results">
-            <div class="test-results-header">
-                <div>📋 Test Cases ({len(test_data['test_cases'])})</div>
-                <div class="bulk-actions">
-                    <button class="bulk-action-btn" id="expand-all">Expand All</button>
-                    <button class="bulk-action-btn" id="collapse-all">Collapse All</button>
-                </div>
-            </div>
-"""
-        
-        # Generate test case details
-        for i, test_case in enumerate(test_data['test_cases'], 1):
-            status_class = f"status-{test_case['status']}"
-            status_text = test_case['status'].upper()
-            cleaned_name = self.clean_test_name(test_case['name'])
-            
-            html_content += f"""
+        # Stream the report to a temporary file and move it into place once
+        # complete, so a partially written report is never visible
+        tmp_file = output_file + '.tmp'
+        try:
+            with open(tmp_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                write = f.write
+                format_time = self.format_time
+                
+                write(_HTML_HEAD.substitute(
+                    name=test_data['name'],
+                    css=_CSS_STYLES,
+                    generated=now_str,
+                    source_section=source_section,
+                    tests=test_data['tests'],
+                    passed=test_data['passed'],
+                    failures=test_data['failures'],
+                    errors=test_data['errors'],
+                    skipped=test_data['skipped'],
+                    total_time=self.format_time(test_data['time']),
+                    case_count=len(test_data['test_cases']),
+                ))
+                
+                # Generate test case details
+                for i, test_case in enumerate(test_data['test_cases'], 1):
+                    status = test_case.status
+                    status_class = _STATUS_CLASS[status]
+                    status_text = _STATUS_TEXT[status]
+                    title = _escape_html(_clean_test_name(test_case.name))
+                    duration = format_time(test_case.time)
+                    
+                    # Passed tests without output have nothing beyond the basic
+                    # details, so emit them without indentation to keep large
+                    # green reports small; the rendered page looks the same
+                    if status == 'passed' and not test_case.system_out:
+                        write(
+                            f'\n<div class="test-case"><div class="test-header"><div class="test-header-left">'
+                            f'<button class="toggle-button" aria-label="Toggle test details">▶</button>'
+                            f'<div class="test-name">{i}. {title}</div></div>'
+                            f'<div class="test-status {status_class}">{status_text}</div></div>'
+                            f'<div class="test-details">'
+                            f'<div class="test-detail-row"><div class="test-detail-label">Full Name:</div>'
+                            f'<div class="test-detail-value">{test_case.name_esc}</div></div>'
+                            f'<div class="test-detail-row"><div class="test-detail-label">Duration:</div>'
+                            f'<div class="test-detail-value">{duration}</div></div>'
+                            f'<div class="test-detail-row"><div class="test-detail-label">Class:</div>'
+                            f'<div class="test-detail-value">{test_case.classname_esc}</div></div>'
+                            f'</div></div>\n'
+                        )
+                        continue
+                    
+                    write(f"""
             <div class="test-case">
                 <div class="test-header">
                     <div class="test-header-left">
                         <button class="toggle-button" aria-label="Toggle test details">▶</button>
                         <div class="test-name">
-                            {i}. {self.escape_html(cleaned_name)}
+                            {i}. {title}
                         </div>
                     </div>
                     <div class="test-status {status_class}">
@@ -656,77 +872,43 @@ class JUnitToHTMLConverter:
                 <div class="test-details">
                     <div class="test-detail-row">
                         <div class="test-detail-label">Full Name:</div>
-                        <div class="test-detail-value">{self.escape_html(test_case['name'])}</div>
+                        <div class="test-detail-value">{test_case.name_esc}</div>
                     </div>
                     <div class="test-detail-row">
                         <div class="test-detail-label">Duration:</div>
-                        <div class="test-detail-value">{self.format_time(test_case['time'])}</div>
+                        <div class="test-detail-value">{duration}</div>
                     </div>
                     <div class="test-detail-row">
                         <div class="test-detail-label">Class:</div>
-                        <div class="test-detail-value">{self.escape_html(test_case['classname'])}</div>
+                        <div class="test-detail-value">{test_case.classname_esc}</div>
                     </div>
-"""
-            
-            # Add status-specific content
-            if test_case['status'] == 'skipped' and test_case['skipped']:
-                html_content += f"""
-                    <div class="skipped-reason">
-                        <strong>Skip Reason:</strong> {self.escape_html(test_case['skipped'])}
-                    </div>
-"""
-            elif test_case['status'] == 'error' and test_case['error']:
-                html_content += f"""
-                    <div class="error-message">
-                        <strong>Error:</strong> {self.escape_html(test_case['error'])}
-                    </div>
-"""
-            elif test_case['status'] == 'failed' and test_case['failure']:
-                html_content += f"""
-                    <div class="error-message">
-                        <strong>Failure:</strong> {self.escape_html(test_case['failure'])}
-                    </div>
-"""
-            
-            # Add system output if available
-            if test_case['system_out']:
-                html_content += f"""
-                    <div class="system-out">
-                        <strong>Output:</strong>
-{self.escape_html(test_case['system_out'])}
-                    </div>
-"""
-            
-            html_content += """
-                </div>
-            </div>
-"""
-        
-        # Close HTML
-        html_content += f"""
-        </div>
-        
-        <div class="footer">
-            <p>Generated by JUnit to HTML Converter • {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-        
-        # Write to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+""")
+                    
+                    # Add status-specific content
+                    status_block = _STATUS_BLOCK.get(status)
+                    if status_block:
+                        message = getattr(test_case, _STATUS_FIELD[status])
+                        if message:
+                            write(status_block.format(_escape_html(message)))
+                    
+                    # Add system output if available
+                    if test_case.system_out:
+                        write(_SYSTEM_OUT_BLOCK.format(_escape_html(test_case.system_out)))
+                    
+                    write(_TEST_CASE_TAIL)
+                
+                # Close HTML
+                write(_HTML_TAIL.substitute(generated=now_str))
+            
+            os.replace(tmp_file, output_file)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
 
     def escape_html(self, text: str) -> str:
         """Escape HTML special characters."""
-        if not text:
-            return ''
-        return (text.replace('&', '&amp;')
-                   .replace('<', '&lt;')
-                   .replace('>', '&gt;')
-                   .replace('"', '&quot;')
-                   .replace("'", '&#x27;'))
+        return _escape_html(text)
 
     def convert(self, input_file: str, output_file: Optional[str] = None) -> str:
         """Convert JUnit XML to HTML."""